@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-import argparse, csv, subprocess, re, statistics, sys
+from __future__ import annotations
+import argparse, atexit, os, queue, select, shutil, signal, subprocess, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
@@ -9,13 +12,17 @@ BUILD_DIR = Path('build')
 WIDTH = 160
 HEIGHT = 96
 PROB = 0.25
-REPEATS = 3
+REPEATS = 2
 STEPS_LIST = [500, 1000, 1500, 2000, 3000, 4000]
 OMP_THREADS = None  # e.g., 8 to fix threads; None to use OpenMP default
 PLOT_FILE_TOTAL = 'steps_vs_time.png'
 CSV_FILE = 'results.csv'
+# a run is killed after max(MIN_TIMEOUT_S, TIMEOUT_FACTOR x the worker's previous run)
+MIN_TIMEOUT_S = 60.0
+TIMEOUT_FACTOR = 10
 
-TIME_RE = re.compile(r"time_ms=([0-9.]+)")
+# --serve workers answer each request with exactly one line: time_ms=<ms>
+TIME_PREFIX = b'time_ms='
 
 # mappings for variants and modes
 VARIANT_DIR = {
@@ -47,34 +54,156 @@ def exe_path(variant_key: str, mode_key: str) -> Path:
     base = f"{vdir}_{suffix}"
     return BUILD_DIR / base
 
-def run_once(exe: Path, steps: int, width: int, height: int, prob: float, omp_threads: Optional[int], extra_args=None) -> float:
-    cmd = [str(exe), '--no-draw', '--steps', str(steps), '--prob', str(prob), '--width', str(width), '--height', str(height)]
-    if extra_args:
-        cmd += list(extra_args)
-    if ('openMP' in exe.name) and (omp_threads is not None):
-        cmd += ['--threads', str(omp_threads)]
-    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if proc.returncode != 0:
-        print(proc.stdout)
-        print(proc.stderr, file=sys.stderr)
+TASKSET = shutil.which('taskset')
+
+def available_cpus() -> list:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def physical_cores(cpus) -> list:
+    # one logical CPU per physical core, so concurrent runs never share SMT siblings;
+    # falls back to every logical CPU when the topology can't be read
+    seen, cores = set(), []
+    for c in cpus:
+        try:
+            siblings = Path(f'/sys/devices/system/cpu/cpu{c}/topology/thread_siblings_list').read_text().strip()
+        except OSError:
+            return list(cpus)
+        if siblings not in seen:
+            seen.add(siblings)
+            cores.append(c)
+    return cores
+
+def pin_prefix(cores) -> list:
+    # taskset is Linux-only; elsewhere runs are left to the OS scheduler
+    if not cores or not TASKSET:
+        return []
+    return [TASKSET, '-c', ','.join(str(c) for c in cores)]
+
+class RunTimeout(Exception):
+    pass
+
+# one persistent `--serve` process per (exe, grid, threads, extra args, cores); see run_server
+_servers = {}
+_last_ok_ms = {}
+_servers_lock = threading.Lock()
+# set once the sweep is aborting; no new workers are started after that
+_stopping = threading.Event()
+
+def server_key(exe: Path, width: int, height: int, prob: float, omp_threads: Optional[int], extra_args=None, cores=None):
+    return (exe, width, height, prob, omp_threads, tuple(extra_args or ()), tuple(cores or ()))
+
+def run_server(exe: Path, width: int, height: int, prob: float, omp_threads: Optional[int], extra_args=None, cores=None) -> subprocess.Popen:
+    key = server_key(exe, width, height, prob, omp_threads, extra_args, cores)
+    with _servers_lock:
+        if _stopping.is_set():
+            raise SystemExit('Benchmark aborted')
+        proc = _servers.get(key)
+        if proc is None or proc.poll() is not None:
+            cmd = pin_prefix(cores) + [str(exe), '--serve', '--prob', str(prob), '--width', str(width), '--height', str(height)]
+            if extra_args:
+                cmd += list(extra_args)
+            if ('openMP' in exe.name) and (omp_threads is not None):
+                cmd += ['--threads', str(omp_threads)]
+            # keep OpenMP threads on their cores inside the pinned set
+            env = dict(os.environ, OMP_PLACES='cores', OMP_PROC_BIND='close')
+            # binary pipes: replies are parsed as bytes, stderr stays attached to the terminal
+            # own session so a hung worker and all its threads can be killed as a group
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, start_new_session=True)
+            _servers[key] = proc
+    return proc
+
+def close_server(key):
+    # only called by the thread that owns the worker, so nothing else is reading its pipes
+    with _servers_lock:
+        proc = _servers.pop(key, None)
+        _last_ok_ms.pop(key, None)
+    if proc is not None:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass  # worker already exited; the caller reports why
+        proc.wait()
+        proc.stdout.close()
+
+def kill_server(key):
+    # may run on another thread than the owner: kill and reap only, the owner's close_server closes the pipes
+    with _servers_lock:
+        proc = _servers.get(key)
+    if proc is not None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+
+def kill_servers():
+    # under the lock so a worker being started right now is either refused or seen here
+    with _servers_lock:
+        _stopping.set()
+        keys = list(_servers)
+    for key in keys:
+        kill_server(key)
+
+# workers run in their own session, so Ctrl-C never reaches them; anything left at exit is killed
+atexit.register(kill_servers)
+
+def read_reply(proc: subprocess.Popen, timeout: float) -> Optional[bytes]:
+    # one reply line, b'' if the worker closed stdout first, None if the deadline passed
+    deadline = time.monotonic() + timeout
+    fd = proc.stdout.fileno()
+    line = b''
+    while not line.endswith(b'\n'):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            return None
+        chunk = os.read(fd, 64)
+        if not chunk:
+            return b''
+        line += chunk
+    return line
+
+def run_once(exe: Path, steps: int, width: int, height: int, prob: float, omp_threads: Optional[int], extra_args=None, cores=None) -> float:
+    key = server_key(exe, width, height, prob, omp_threads, extra_args, cores)
+    proc = run_server(exe, width, height, prob, omp_threads, extra_args=extra_args, cores=cores)
+    timeout = max(MIN_TIMEOUT_S, TIMEOUT_FACTOR * _last_ok_ms.get(key, 0.0) / 1000)
+    try:
+        proc.stdin.write(b'%d\n' % steps)
+        proc.stdin.flush()
+    except BrokenPipeError:
         raise SystemExit(f'Executable run failed: {exe}')
-    m = TIME_RE.search(proc.stdout)
-    if not m:
-        raise SystemExit(f'Unexpected output from {exe}: {proc.stdout.strip()}')
-    return float(m.group(1))
-
-def run_series(label: str, exe: Path, steps_list, repeats, width, height, prob, omp_threads, extra_args=None):
-    if not exe.exists():
-        print(f"Skip missing executable: {exe}")
+    line = read_reply(proc, timeout)
+    if line is None:
+        kill_server(key)
+        raise RunTimeout(f'{exe} steps={steps} exceeded {timeout:.1f}s; killed')
+    if not line:
+        raise SystemExit(f'Executable run failed: {exe}')
+    if not line.startswith(TIME_PREFIX):
+        raise SystemExit(f'Unexpected output from {exe}: {line.decode(errors="replace").strip()}')
+    ms = float(line[len(TIME_PREFIX):])
+    _last_ok_ms[key] = ms
+    return ms
+
+def run_series(label: str, exe: Path, steps_list, repeats, width, height, prob, omp_threads, extra_args=None, cores=None):
+    xs, ys = [], []
+    try:
+        # one discarded warmup per worker: OpenMP thread pool, page cache and grid allocation
+        run_once(exe, steps_list[0], width, height, prob, omp_threads, extra_args=extra_args, cores=cores)
+        for s in steps_list:
+            # min over repeats: jitter from the OS only ever adds time to a deterministic run
+            t = min(run_once(exe, s, width, height, prob, omp_threads, extra_args=extra_args, cores=cores) for _ in range(repeats))
+            xs.append(s)
+            ys.append(t)
+            print(f'{label}: steps={s} min_ms={t:.2f}')
+    except RunTimeout as e:
+        # keep whatever step counts finished and move on to the next series
+        print(f'{label}: {e}', file=sys.stderr)
+    finally:
+        close_server(server_key(exe, width, height, prob, omp_threads, extra_args, cores))
+    if not xs:
         return None
-    xs, ys, err = [], [], []
-    for s in steps_list:
-        vals = [run_once(exe, s, width, height, prob, omp_threads, extra_args=extra_args) for _ in range(repeats)]
-        xs.append(s)
-        ys.append(statistics.mean(vals))
-        err.append(statistics.pstdev(vals) if repeats > 1 else 0.0)
-        print(f'{label}: steps={s} mean_ms={ys[-1]:.2f} sd={err[-1]:.2f}')
-    return {'label': label, 'x': xs, 'y': ys, 'e': err}
+    return {'label': label, 'x': xs, 'y': ys}
 
 def parse_args():
     p = argparse.ArgumentParser(description='Benchmark Life variants and OpenMP modes.')
@@ -87,9 +216,10 @@ def parse_args():
     p.add_argument('--width', type=int, default=WIDTH, help='Grid width for each run (default: 160).')
     p.add_argument('--height', type=int, default=HEIGHT, help='Grid height for each run (default: 96).')
     p.add_argument('--prob', type=float, default=PROB, help='Initial probability for a cell to be alive (default: 0.25).')
-    p.add_argument('--repeats', type=int, default=REPEATS, help='Number of times to repeat each benchmark for averaging (default: 3).')
+    p.add_argument('--repeats', type=int, default=REPEATS, help='Number of timed runs per step count after one warmup run; the minimum is reported (default: 2).')
     p.add_argument('--steps', default=','.join(str(x) for x in STEPS_LIST), help='Comma-separated list of step counts to benchmark (default: 500,1000,1500,2000,3000,4000).')
     p.add_argument('--threads', type=int, default=None, help='Number of OpenMP threads to use (default: use OpenMP default).')
+    p.add_argument('--jobs', type=int, default=None, help='Number of series to benchmark concurrently (default: physical core count / --threads).')
     p.add_argument('--build-dir', default=str(BUILD_DIR), help='Path to the build directory containing executables (default: build).')
     p.add_argument('--csv', default=CSV_FILE, help='Path to save benchmark results as CSV (default: results.csv).')
     p.add_argument('--plot', default=PLOT_FILE_TOTAL, help='Path to save the output plot as PNG (default: steps_vs_time.png).')
@@ -106,7 +236,7 @@ def main():
     variants = [v.strip().lower() for v in args.variants.split(',') if v.strip()]
     modes = [m.strip().lower() for m in args.modes.split(',') if m.strip()]
     steps_list = [int(x) for x in args.steps.split(',') if x.strip()]
-    blockrows_list = [int(x) for x in args.blockrows.split(',') if x.strip()]
+    blockrows_list = sorted(set(int(x) for x in args.blockrows.split(',') if x.strip()))
 
     # Determine compare type and auto-expand variants for 'variants' comparison when not explicitly provided
     compare_type = args.compare
@@ -131,60 +261,119 @@ def main():
     if compare_type == 'variants' and len(modes) != 1:
         raise SystemExit("'compare=variants' requires exactly one mode (use --modes <one>)")
 
-    series = []
-    csv_rows = [] 
+    # Validate run counts
+    if args.repeats < 1:
+        raise SystemExit('--repeats must be at least 1')
+    if not steps_list:
+        raise SystemExit('--steps needs at least one step count')
+    if args.jobs is not None and args.jobs < 1:
+        raise SystemExit('--jobs must be at least 1')
+    if args.threads is not None and args.threads < 1:
+        raise SystemExit('--threads must be at least 1')
 
-    print(f'Benchmark: {args.width}x{args.height}, prob={args.prob}, repeats={args.repeats}, threads={args.threads}, compare={compare_type}')
+    # Disjoint sets of physical cores, one per concurrent series
+    cpus = available_cpus()
+    cores = physical_cores(cpus)
+    per_slot = max(args.threads or 1, 1)
+    n_slots = max(1, len(cores) // per_slot)
+    core_slots = queue.Queue()
+    for i in range(n_slots):
+        core_slots.put(cores[i * per_slot:(i + 1) * per_slot])
+    # by default one series per slot, so --jobs and the slot queue agree
+    jobs = args.jobs or n_slots
 
-    for v in variants:
-        for m in modes:
-            if m == 'tasks':
-                for br in blockrows_list:
-                    exe = exe_path(v, m).with_suffix('')
-                    if compare_type == 'parallel':
-                        label = f'{MODE_SUFFIX[m]} (blockrows={br})'
-                    elif compare_type == 'variants':
-                        label = f'{VARIANT_DIR[v]} (blockrows={br})'
-                    else:
-                        label = f'{VARIANT_DIR[v]} {MODE_SUFFIX[m]} (blockrows={br})'
-                    extra = ['--blockrows', str(br)]
-                    if args.rule:
-                        extra += ['--rule', args.rule]
-                    result = run_series(label, exe, steps_list, args.repeats, args.width, args.height, args.prob, args.threads, extra_args=extra)
-                    if result:
-                        series.append(result)
-                        for x, y, e in zip(result['x'], result['y'], result['e']):
-                            csv_rows.append([VARIANT_DIR[v], MODE_SUFFIX[m], br, x, y, e, exe.name])
-            else:
-                exe = exe_path(v, m).with_suffix('')
-                if compare_type == 'parallel':
-                    label = f'{MODE_SUFFIX[m]}'
-                elif compare_type == 'variants':
-                    label = f'{VARIANT_DIR[v]}'
-                else:
-                    label = f'{VARIANT_DIR[v]} {MODE_SUFFIX[m]}'
-                extra = []
-                if args.rule:
-                    extra += ['--rule', args.rule]
-                result = run_series(label, exe, steps_list, args.repeats, args.width, args.height, args.prob, args.threads, extra_args=extra)
+    print(f'Benchmark: {args.width}x{args.height}, prob={args.prob}, repeats={args.repeats}, threads={args.threads}, jobs={jobs}, compare={compare_type}')
+
+    # Resolve and stat each executable once per (variant, mode), warning once for each missing pair
+    exe_cache = {(v, m): exe_path(v, m).with_suffix('') for v in variants for m in modes}
+    for (v, m), exe in list(exe_cache.items()):
+        if not exe.exists():
+            print(f"Skip missing executable: {exe}")
+            del exe_cache[(v, m)]
+    # only tasks mode takes --blockrows; other modes run a single series
+    configs = [(v, m, br) for v in variants for m in modes if (v, m) in exe_cache
+               for br in (blockrows_list if m == 'tasks' else [None])]
+
+    # Collect every series first so independent executables can run concurrently
+    specs = []
+    for v, m, br in configs:
+        exe = exe_cache[(v, m)]
+        if compare_type == 'parallel':
+            label = f'{MODE_SUFFIX[m]}'
+        elif compare_type == 'variants':
+            label = f'{VARIANT_DIR[v]}'
+        else:
+            label = f'{VARIANT_DIR[v]} {MODE_SUFFIX[m]}'
+        extra = []
+        if br is not None:
+            label += f' (blockrows={br})'
+            extra += ['--blockrows', str(br)]
+        if args.rule:
+            extra += ['--rule', args.rule]
+        # tasks runs, and OpenMP runs without --threads, use every core so they must not overlap each other
+        exclusive = m == 'tasks' or (m != 'seq' and args.threads is None)
+        specs.append({'label': label, 'exe': exe, 'extra': extra, 'row': [VARIANT_DIR[v], MODE_SUFFIX[m], '' if br is None else br], 'exclusive': exclusive})
+
+    exclusive_gate = threading.Semaphore(1)
+
+    def run_spec(spec):
+        with exclusive_gate if spec['exclusive'] else nullcontext():
+            # OpenMP runs without --threads use every CPU: hold every slot so nothing runs alongside them
+            all_cores = 'openMP' in spec['exe'].name and args.threads is None
+            slots = [core_slots.get() for _ in range(n_slots if all_cores else 1)]
+            try:
+                return run_series(spec['label'], spec['exe'], steps_list, args.repeats, args.width, args.height, args.prob, args.threads, extra_args=spec['extra'], cores=cpus if all_cores else slots[0])
+            finally:
+                for slot in slots:
+                    core_slots.put(slot)
+
+    # Stream CSV rows to a sibling file as each series finishes so partial sweeps survive a crash;
+    # it only replaces args.csv once the sweep completes, so an aborted run keeps the last good results
+    import csv
+    results = [None] * len(specs)
+    partial_csv = f'{args.csv}.partial'
+    if specs:
+        with open(partial_csv, 'w', newline='') as csv_f:
+            csv_w = csv.writer(csv_f)
+            csv_w.writerow(['variant', 'mode', 'blockrows', 'steps', 'min_ms', 'exe'])
+            csv_f.flush()
+            csv_lock = threading.Lock()
+
+            def run_and_record(spec):
+                # written by the worker itself so finished series are kept even if the main loop aborts
+                result = run_spec(spec)
                 if result:
-                    series.append(result)
-                    for x, y, e in zip(result['x'], result['y'], result['e']):
-                        csv_rows.append([VARIANT_DIR[v], MODE_SUFFIX[m], '', x, y, e, exe.name])
-
-    # Save CSV
-    if csv_rows:
-        with open(args.csv, 'w', newline='') as f:
-            w = csv.writer(f)
-            w.writerow(['variant', 'mode', 'blockrows', 'steps', 'mean_ms', 'sd_ms', 'exe'])
-            w.writerows(csv_rows)
+                    with csv_lock:
+                        csv_w.writerows(spec['row'] + [x, y, spec['exe'].name] for x, y in zip(result['x'], result['y']))
+                        csv_f.flush()
+                return result
+
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(run_and_record, spec): i for i, spec in enumerate(specs)}
+                try:
+                    for fut in as_completed(futures):
+                        results[futures[fut]] = fut.result()
+                except BaseException as e:
+                    # one failed series (or Ctrl-C) aborts the sweep: drop queued series, stop running ones
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    kill_servers()
+                    print(f'Sweep aborted; results so far kept in {partial_csv}', file=sys.stderr)
+                    if isinstance(e, KeyboardInterrupt):
+                        raise SystemExit('Interrupted; killed running workers.')
+                    raise
+        os.replace(partial_csv, args.csv)
+    series = [r for r in results if r]
+    if series:
         print(f'Saved CSV -> {args.csv}')
+    elif specs:
+        print(f'No data collected; CSV {args.csv} has only a header.')
     else:
         print('No data collected; CSV not written.')
 
     # Plot
     try:
         import matplotlib.pyplot as plt
+        import numpy as np  # always present alongside matplotlib
     except ImportError:
         print('matplotlib not installed; skipping plot.')
         return
@@ -200,11 +389,12 @@ def main():
     for i, s in enumerate(series):
         fmt = styles[i % len(styles)]
         color = next(color_cycle)
-        plt.errorbar(s['x'], s['y'], yerr=s['e'], fmt=fmt, color=color, capsize=4, label=s['label'])
+        # hand matplotlib typed arrays so it skips per-element conversion
+        plt.plot(np.asarray(s['x'], dtype=np.int32), np.asarray(s['y'], dtype=np.float64), fmt, color=color, label=s['label'])
 
     plt.xlabel('Steps')
-    plt.ylabel('Total time (ms)')
-    title = f'Total time vs Steps ({args.width}x{args.height}, prob={args.prob})'
+    plt.ylabel('Min time (ms)')
+    title = f'Min time vs Steps ({args.width}x{args.height}, prob={args.prob})'
     if compare_type == 'parallel':
         title += f' [parallel: {VARIANT_DIR[variants[0]]}]'
     elif compare_type == 'variants':
@@ -79,6 +79,7 @@ void draw(const Grid& g) {
 int main(int argc, char* argv[]) {
 	std::ios::sync_with_stdio(false);
 	bool draw_enabled = true;
+	bool serve = false;
 	int steps = -1;
 	double prob = 0.25;
 	int threads = -1; // -1 = default
@@ -87,6 +88,7 @@ int main(int argc, char* argv[]) {
 	for (int i = 1; i < argc; ++i) {
 		std::string a = argv[i];
 		if (a == "--no-draw") draw_enabled = false;
+		else if (a == "--serve") { serve = true; draw_enabled = false; }
 		else if (a == "--steps" && i + 1 < argc) steps = std::stoi(argv[++i]);
 		else if (a == "--prob" && i + 1 < argc) prob = std::stod(argv[++i]);
 		else if (a == "--width" && i + 1 < argc) gWidth = std::stoi(argv[++i]);
@@ -109,6 +111,25 @@ int main(int argc, char* argv[]) {
 	Grid nxt = cur;
 	random_init(cur, prob);
 
+	// Serve mode: read one step count per stdin line, rerun from a fresh grid and reply with one timing line
+	if (serve) {
+		int n = 0;
+		while (std::cin >> n) {
+			if (n <= 0) {
+				std::cout << "error=invalid steps" << std::endl;
+				continue;
+			}
+			random_init(cur, prob);
+			auto t0 = std::chrono::steady_clock::now();
+			for (int i = 0; i < n; ++i) {
+				step_tasks(cur, nxt, blockRows);
+			}
+			auto t1 = std::chrono::steady_clock::now();
+			std::cout << "time_ms=" << std::chrono::duration<double, std::milli>(t1 - t0).count() << std::endl;
+		}
+		return 0;
+	}
+
 	if (!draw_enabled && steps > 0) {
 		auto t0 = std::chrono::steady_clock::now();
 		for (int i = 0; i < steps; ++i) {